@@ -21,9 +21,16 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from webdriver_manager.firefox import GeckoDriverManager
+import io
+import json
+import os
+import sqlite3
+import threading
 import time
 import logging
 
+from publication_store import open_store, save_publications
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -73,7 +80,12 @@ EMAIL_CONFIG = {
     'sender_password': 'your-app-specific-password',  # Replace with your password
     'recipient_email': 'recipient@example.com',  # Replace with recipient email
     'smtp_server': 'owa.hs-ruhrwest.de',
-    'smtp_port': 587
+    'smtp_port': 587,
+    'connect_timeout': 10,  # Seconds to wait for the SMTP connection
+    'send_timeout': 30,  # Seconds allowed per SMTP command (STARTTLS, login, send)
+    'delivery_timeout': 300,  # Seconds main() waits for the background sender; later deliveries are dropped
+    'health_check_file': 'email_health.json',  # Cached result of the preflight check
+    'health_check_ttl': 24 * 60 * 60  # Seconds a successful preflight check stays valid
 }
 
 def send_email(subject, new_entries):
@@ -146,7 +158,8 @@ def send_email(subject, new_entries):
     msg.attach(MIMEText(html_body, "html"))
 
     try:
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
+        with smtplib.SMTP(smtp_server, smtp_port, timeout=EMAIL_CONFIG['connect_timeout']) as server:
+            server.sock.settimeout(EMAIL_CONFIG['send_timeout'])
             server.starttls()
             server.login(sender, password)
             server.sendmail(sender, recipient, msg.as_string())
@@ -156,6 +169,112 @@ def send_email(subject, new_entries):
         logger.error(f"Error sending email: {e}")
         return False
 
+def check_email_health():
+    """
+    Preflight check of the SMTP server using the diagnostics from test_email.py.
+
+    A successful result is cached in EMAIL_CONFIG['health_check_file'] for
+    EMAIL_CONFIG['health_check_ttl'] seconds, so most runs skip the check.
+
+    Returns:
+        bool: True if the SMTP server is reachable and accepts the credentials
+    """
+    from test_email import test_network_connectivity, test_authentication
+
+    sender = EMAIL_CONFIG['sender_email']
+    password = EMAIL_CONFIG['sender_password']
+    smtp_server = EMAIL_CONFIG['smtp_server']
+    smtp_port = EMAIL_CONFIG['smtp_port']
+    timeout = EMAIL_CONFIG['connect_timeout']
+    cache_file = EMAIL_CONFIG['health_check_file']
+    cache_key = f"{sender}@{smtp_server}:{smtp_port}"
+
+    if sender == 'your-email@hs-ruhrwest.de' or password == 'your-app-specific-password':
+        logger.warning("Email credentials not configured! Please update EMAIL_CONFIG in the script.")
+        return False
+
+    # Use the cached result if it is recent and for the same configuration
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, "r", encoding='utf-8') as f:
+                cached = json.load(f)
+            checked_at = cached.get('checked_at') if isinstance(cached, dict) else None
+            if not isinstance(checked_at, (int, float)) or isinstance(checked_at, bool):
+                logger.debug("Ignoring malformed email health cache")
+            elif cached.get('key') == cache_key and time.time() - checked_at < EMAIL_CONFIG['health_check_ttl']:
+                logger.info("Email preflight check: cached OK")
+                return True
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable email health cache: {e}")
+
+    # Collect the diagnostics report; it is only shown when debugging
+    report = io.StringIO()
+    healthy = (test_network_connectivity(smtp_server, smtp_port, timeout=timeout, out=report) and
+               test_authentication(smtp_server, smtp_port, sender, password, timeout=timeout, out=report))
+    logger.debug(report.getvalue())
+
+    if healthy:
+        logger.info("Email preflight check: OK")
+        try:
+            with open(cache_file, "w", encoding='utf-8') as f:
+                json.dump({'key': cache_key, 'checked_at': time.time()}, f)
+        except OSError as e:
+            logger.warning(f"Could not cache email preflight result in {cache_file}: {e}")
+    else:
+        logger.error("Email preflight check failed! Run test_email.py for detailed diagnostics.")
+        invalidate_email_health()
+    return healthy
+
+def invalidate_email_health():
+    """Remove the cached preflight result so the next run checks again."""
+    try:
+        os.remove(EMAIL_CONFIG['health_check_file'])
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not remove cached email preflight result: {e}")
+
+def log_undelivered(new_entries):
+    """
+    Log the publications of a notification that was not delivered.
+
+    Their links are already saved as known, so they will not be notified
+    again; this log entry is the record of what was missed.
+    """
+    logger.error(f"Notification for {len(new_entries)} new publications was not delivered and will not be retried:")
+    for entry in new_entries:
+        logger.error(f"  {entry['title']} - {entry['link']}")
+
+def send_email_in_background(subject, new_entries):
+    """
+    Run the preflight check and send the email in a background thread.
+
+    The thread is a daemon, so a hanging mail server can never keep the
+    process alive; callers wait for it with a bounded join().
+
+    Args:
+        subject (str): Email subject
+        new_entries (list): List of publication dictionaries
+
+    Returns:
+        threading.Thread: The started sender thread
+    """
+    def deliver():
+        try:
+            if not check_email_health():
+                log_undelivered(new_entries)
+                return
+            if not send_email(subject, new_entries):
+                invalidate_email_health()
+                log_undelivered(new_entries)
+        except Exception as e:
+            logger.error(f"Unexpected error in email sender: {e}")
+            log_undelivered(new_entries)
+
+    thread = threading.Thread(target=deliver, name="email-sender", daemon=True)
+    thread.start()
+    return thread
+
 def load_known_links(filename):
     """Load known links from file."""
     if os.path.exists(filename):
@@ -381,7 +500,6 @@ def scrape_fhg_links(url, known_links):
 
     if economic_entries:
         logger.info(f"{len(economic_entries)} new economic AI publications found!")
-        send_email("New Economic AI Publications from Fraunhofer", economic_entries)
     else:
         logger.info("No new economic AI publications found.")
 
@@ -394,6 +512,7 @@ def main():
     
     url = "https://www.iuk.fraunhofer.de/de/forschung-entwicklung/wissenschaftliche-publikationen/ki.html"
     link_file = "known_links.txt"
+    db_file = "publications.db"
 
     # Load known links
     known_links = load_known_links(link_file)
@@ -402,10 +521,35 @@ def main():
     # Scrape for new economic publications
     known_links, new_entries = scrape_fhg_links(url, known_links)
 
+    # Notify in the background so a slow mail server cannot delay saving the state
+    email_thread = None
+    if new_entries:
+        email_thread = send_email_in_background("New Economic AI Publications from Fraunhofer", new_entries)
+
     # Save updated links
     save_known_links(link_file, known_links)
     logger.info(f"Saved {len(known_links)} total known publications")
 
+    # Store economic publications for querying and export (see publication_store.py).
+    # The store is a secondary index, so a failure here must not fail the run.
+    if new_entries:
+        try:
+            conn = open_store(db_file)
+            try:
+                saved = save_publications(conn, new_entries)
+                logger.info(f"Stored {saved} publications in {db_file}")
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Error storing publications in {db_file}: {e}")
+
+    if email_thread:
+        delivery_timeout = EMAIL_CONFIG['delivery_timeout']
+        email_thread.join(delivery_timeout)
+        if email_thread.is_alive():
+            logger.error(f"Email delivery did not finish within {delivery_timeout} seconds, giving up")
+            log_undelivered(new_entries)
+
     logger.info("Monitoring complete!")
 
 if __name__ == "__main__":
@@ -0,0 +1,613 @@
+#!/usr/bin/env python3
+"""
+KlingelAI - Publication Store
+
+Local SQLite store for the economic AI publications found by KlingelAI.py.
+Provides fast filtering (year, type, keyword, author, date range) backed by
+indexes and an FTS5 full-text index, paginated queries, streaming export to
+JSONL, CSV or Parquet, a command line interface and a small HTTP API.
+
+Usage:
+    python publication_store.py query --keyword "supply chain" --year 2024
+    python publication_store.py export --format csv --output publications.csv
+    python publication_store.py serve --port 8000
+"""
+
+import argparse
+import calendar
+import csv
+import io
+import json
+import logging
+import os
+import sqlite3
+import sys
+from datetime import date as Date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_FILE = "publications.db"
+
+# Columns returned by queries and written by exports (in this order)
+PUBLICATION_FIELDS = [
+    'link', 'title', 'abstract', 'authors', 'date', 'published',
+    'year', 'publication_type', 'first_seen'
+]
+
+EXPORT_FORMATS = ['jsonl', 'csv', 'parquet']
+
+# Date formats seen on the Fraunhofer publication pages, with their precision
+DATE_FORMATS = [
+    ('%Y-%m-%d', 'day'), ('%d.%m.%Y', 'day'), ('%d/%m/%Y', 'day'),
+    ('%Y-%m', 'month'), ('%m/%Y', 'month'), ('%Y', 'year')
+]
+
+# Rows fetched per round trip when streaming results
+FETCH_SIZE = 1000
+
+# Above this many matches a page is read by walking the date index instead of sorting all matches
+INDEX_WALK_THRESHOLD = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS publications (
+    id INTEGER PRIMARY KEY,
+    link TEXT NOT NULL UNIQUE,
+    title TEXT,
+    abstract TEXT,
+    authors TEXT,
+    date TEXT,
+    published TEXT,
+    published_end TEXT,
+    year TEXT,
+    publication_type TEXT,
+    first_seen TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_publications_year ON publications(year);
+CREATE INDEX IF NOT EXISTS idx_publications_type_nocase ON publications(publication_type COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_publications_published_id ON publications(published, id, published_end);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS publications_fts USING fts5(
+    title, abstract, authors,
+    content='publications', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS publications_ai AFTER INSERT ON publications BEGIN
+    INSERT INTO publications_fts(rowid, title, abstract, authors)
+    VALUES (new.id, new.title, new.abstract, new.authors);
+END;
+
+CREATE TRIGGER IF NOT EXISTS publications_ad AFTER DELETE ON publications BEGIN
+    INSERT INTO publications_fts(publications_fts, rowid, title, abstract, authors)
+    VALUES ('delete', old.id, old.title, old.abstract, old.authors);
+END;
+
+CREATE TRIGGER IF NOT EXISTS publications_au AFTER UPDATE ON publications BEGIN
+    INSERT INTO publications_fts(publications_fts, rowid, title, abstract, authors)
+    VALUES ('delete', old.id, old.title, old.abstract, old.authors);
+    INSERT INTO publications_fts(rowid, title, abstract, authors)
+    VALUES (new.id, new.title, new.abstract, new.authors);
+END;
+"""
+
+def open_store(db_file=DEFAULT_DB_FILE):
+    """
+    Open (and create if needed) the publication database.
+
+    Args:
+        db_file (str): Path to the SQLite database file
+
+    Returns:
+        sqlite3.Connection: Connection with rows returned as sqlite3.Row
+    """
+    conn = connect_store(db_file)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def connect_store(db_file=DEFAULT_DB_FILE):
+    """
+    Connect to a publication database that open_store() has already created.
+
+    Args:
+        db_file (str): Path to the SQLite database file
+
+    Returns:
+        sqlite3.Connection: Connection with rows returned as sqlite3.Row
+    """
+    conn = sqlite3.connect(db_file)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def date_period(date):
+    """
+    Convert a scraped date string to the ISO dates (YYYY-MM-DD) it covers.
+
+    Year-only and month-only dates cover the whole year or month, e.g.
+    '2024' gives ('2024-01-01', '2024-12-31').
+
+    Args:
+        date (str): Date as shown on the publication page
+
+    Returns:
+        tuple: (first_day, last_day), or (None, None) if the date could not be parsed
+    """
+    if not date:
+        return None, None
+    date = date.strip()
+    for date_format, precision in DATE_FORMATS:
+        try:
+            start = datetime.strptime(date, date_format).date()
+        except ValueError:
+            continue
+        if precision == 'year':
+            end = Date(start.year, 12, 31)
+        elif precision == 'month':
+            end = Date(start.year, start.month, calendar.monthrange(start.year, start.month)[1])
+        else:
+            end = start
+        return start.isoformat(), end.isoformat()
+    return None, None
+
+def _stored_period(date):
+    """
+    Return the (published, published_end) column values for a scraped date.
+
+    Undated publications store '' instead of NULL so that ordering by
+    (published DESC, id DESC) can walk idx_publications_published_id;
+    '' sorts after every ISO date in descending order.
+    """
+    start, end = date_period(date)
+    return start or '', end or ''
+
+def save_publications(conn, entries):
+    """
+    Insert or update publications in the store.
+
+    Args:
+        conn (sqlite3.Connection): Store connection
+        entries (list): List of publication dictionaries as built by scrape_fhg_links()
+
+    Returns:
+        int: Number of publications written
+    """
+    first_seen = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    rows = [
+        (
+            entry['link'],
+            entry.get('title'),
+            entry.get('abstract'),
+            entry.get('authors'),
+            entry.get('date'),
+            *_stored_period(entry.get('date')),
+            entry.get('year'),
+            entry.get('publication_type'),
+            first_seen
+        )
+        for entry in entries
+    ]
+    with conn:
+        conn.executemany("""
+            INSERT INTO publications
+                (link, title, abstract, authors, date, published, published_end,
+                 year, publication_type, first_seen)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(link) DO UPDATE SET
+                title = excluded.title,
+                abstract = excluded.abstract,
+                authors = excluded.authors,
+                date = excluded.date,
+                published = excluded.published,
+                published_end = excluded.published_end,
+                year = excluded.year,
+                publication_type = excluded.publication_type
+        """, rows)
+    return len(rows)
+
+def _fts_phrases(text):
+    """Quote user input as FTS5 phrases; a trailing '*' is kept as prefix search."""
+    phrases = []
+    for term in text.split():
+        prefix = term.endswith('*')
+        term = term.rstrip('*')
+        if term:
+            phrases.append('"' + term.replace('"', '""') + '"' + ('*' if prefix else ''))
+    return " ".join(phrases)
+
+def _date_bound(value):
+    """
+    Parse a date range bound given as a year, month or day.
+
+    Raises:
+        ValueError: If the bound is not a recognised date
+    """
+    start, end = date_period(str(value))
+    if start is None:
+        raise ValueError(f"Invalid date: {value} (use YYYY, YYYY-MM or YYYY-MM-DD)")
+    return start, end
+
+def _build_where(filters):
+    """
+    Build the WHERE clause for a set of filters.
+
+    Args:
+        filters (dict): Any of year, publication_type, keyword, author, date_from, date_to
+
+    Returns:
+        tuple: (sql, params)
+
+    Raises:
+        ValueError: If date_from or date_to is not a recognised date
+    """
+    clauses = []
+    params = []
+
+    if filters.get('year'):
+        clauses.append("p.year = ?")
+        params.append(str(filters['year']))
+    if filters.get('publication_type'):
+        clauses.append("p.publication_type = ? COLLATE NOCASE")
+        params.append(filters['publication_type'])
+    # Publications match when the period they cover (e.g. a whole year for
+    # year-only dates) overlaps the requested range
+    if filters.get('date_from'):
+        date_from = _date_bound(filters['date_from'])[0]
+        # No period is longer than a year, so this implied bound lets the date index narrow the scan
+        earliest = (Date.fromisoformat(date_from) - timedelta(days=366)).isoformat()
+        clauses.append("p.published_end >= ? AND p.published >= ?")
+        params.extend([date_from, earliest])
+    if filters.get('date_to'):
+        clauses.append("p.published > '' AND p.published <= ?")
+        params.append(_date_bound(filters['date_to'])[1])
+
+    match = []
+    if filters.get('keyword') and _fts_phrases(filters['keyword']):
+        match.append("{title abstract} : (" + _fts_phrases(filters['keyword']) + ")")
+    if filters.get('author') and _fts_phrases(filters['author']):
+        match.append("authors : (" + _fts_phrases(filters['author']) + ")")
+    if match:
+        # With other filters, let their index drive the scan and only test FTS membership
+        # (unary + keeps SQLite from iterating all full-text matches instead)
+        column = "+p.id" if clauses else "p.id"
+        clauses.append(f"{column} IN (SELECT rowid FROM publications_fts WHERE publications_fts MATCH ?)")
+        params.append(" AND ".join(match))
+
+    sql = " WHERE " + " AND ".join(clauses) if clauses else ""
+    return sql, params
+
+def _select(filters, walk_index=False):
+    """
+    Build the ordered SELECT statement for a set of filters.
+
+    Args:
+        filters (dict): Any of year, publication_type, keyword, author, date_from, date_to
+        walk_index (bool): Read rows in idx_publications_published_id order instead
+            of sorting the matches; faster for pages out of many matches
+
+    Returns:
+        tuple: (sql, params)
+    """
+    where, params = _build_where(filters)
+    indexed = " INDEXED BY idx_publications_published_id" if walk_index else ""
+    columns = ", ".join(
+        "NULLIF(p.published, '') AS published" if field == 'published' else "p." + field
+        for field in PUBLICATION_FIELDS
+    )
+    sql = (
+        f"SELECT {columns} FROM publications p{indexed}{where} "
+        "ORDER BY p.published DESC, p.id DESC"
+    )
+    return sql, params
+
+def query_publications(conn, filters=None, page=1, per_page=20):
+    """
+    Return one page of publications matching the filters.
+
+    Args:
+        conn (sqlite3.Connection): Store connection
+        filters (dict): Any of year, publication_type, keyword, author, date_from, date_to
+        page (int): Page number (starting at 1)
+        per_page (int): Results per page
+
+    Returns:
+        dict: {'page', 'per_page', 'total', 'results'}
+    """
+    filters = filters or {}
+    page = max(int(page), 1)
+    per_page = max(int(per_page), 1)
+
+    where, params = _build_where(filters)
+    if where and not any(filters.get(key) for key in ('year', 'publication_type', 'date_from', 'date_to')):
+        # Full-text filters only: count in the FTS index without touching the table
+        count_sql = "SELECT COUNT(*) FROM publications_fts WHERE publications_fts MATCH ?"
+    else:
+        count_sql = f"SELECT COUNT(*) FROM publications p{where}"
+    total = conn.execute(count_sql, params).fetchone()[0]
+
+    sql, params = _select(filters, walk_index=total > INDEX_WALK_THRESHOLD)
+    rows = conn.execute(sql + " LIMIT ? OFFSET ?", params + [per_page, (page - 1) * per_page])
+
+    return {
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'results': [dict(row) for row in rows]
+    }
+
+def iter_publications(conn, filters=None):
+    """
+    Stream all publications matching the filters.
+
+    Args:
+        conn (sqlite3.Connection): Store connection
+        filters (dict): Any of year, publication_type, keyword, author, date_from, date_to
+
+    Yields:
+        dict: Publication record
+    """
+    sql, params = _select(filters or {})
+    cursor = conn.execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(FETCH_SIZE)
+        if not rows:
+            break
+        for row in rows:
+            yield dict(row)
+
+def write_jsonl(records, stream):
+    """Write records to a text stream as JSON lines."""
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+def write_csv(records, stream):
+    """Write records to a text stream as CSV with a header row."""
+    writer = csv.DictWriter(stream, fieldnames=PUBLICATION_FIELDS)
+    writer.writeheader()
+    count = 0
+    for record in records:
+        writer.writerow(record)
+        count += 1
+    return count
+
+def write_parquet(records, filename):
+    """Write records to a Parquet file in batches (requires pyarrow)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    schema = pa.schema([(field, pa.string()) for field in PUBLICATION_FIELDS])
+    count = 0
+    batch = []
+    with pq.ParquetWriter(filename, schema) as writer:
+        for record in records:
+            batch.append(record)
+            if len(batch) >= FETCH_SIZE:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    return count
+
+def export_publications(conn, export_format, output, filters=None):
+    """
+    Export publications matching the filters.
+
+    Args:
+        conn (sqlite3.Connection): Store connection
+        export_format (str): One of 'jsonl', 'csv', 'parquet'
+        output (str): Output file name ('-' for stdout, not supported for Parquet)
+        filters (dict): Any of year, publication_type, keyword, author, date_from, date_to
+
+    Returns:
+        int: Number of exported publications
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    records = iter_publications(conn, filters)
+
+    if export_format == 'parquet':
+        if output == '-':
+            raise ValueError("Parquet export needs an output file")
+        return write_parquet(records, output)
+
+    writer = write_jsonl if export_format == 'jsonl' else write_csv
+    if output == '-':
+        return writer(records, sys.stdout)
+    with open(output, "w", encoding='utf-8', newline='') as f:
+        return writer(records, f)
+
+def _filters_from_query(query):
+    """Extract filters from parsed URL query parameters."""
+    keys = {
+        'year': 'year',
+        'type': 'publication_type',
+        'keyword': 'keyword',
+        'author': 'author',
+        'from': 'date_from',
+        'to': 'date_to'
+    }
+    return {name: query[key][0] for key, name in keys.items() if key in query}
+
+class PublicationRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP API over the publication store.
+
+    GET /publications?year=&type=&keyword=&author=&from=&to=&page=&per_page=
+    GET /export?format=jsonl|csv&<same filters>
+    """
+
+    db_file = DEFAULT_DB_FILE
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        filters = _filters_from_query(query)
+
+        # Validate the filters before any response is started (exports stream lazily)
+        try:
+            _build_where(filters)
+        except ValueError as e:
+            self._send_error(400, str(e))
+            return
+
+        conn = connect_store(self.db_file)
+        try:
+            if url.path == '/publications':
+                try:
+                    page = int(query.get('page', ['1'])[0])
+                    per_page = min(int(query.get('per_page', ['20'])[0]), 500)
+                except ValueError:
+                    self._send_error(400, "page and per_page must be integers")
+                    return
+                body = json.dumps(query_publications(conn, filters, page, per_page), ensure_ascii=False)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.end_headers()
+                self.wfile.write(body.encode('utf-8'))
+
+            elif url.path == '/export':
+                export_format = query.get('format', ['jsonl'])[0]
+                if export_format not in ('jsonl', 'csv'):
+                    self._send_error(400, "format must be jsonl or csv")
+                    return
+                content_type = "application/x-ndjson" if export_format == 'jsonl' else "text/csv"
+                self.send_response(200)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.end_headers()
+                # wfile is unbuffered; buffer so rows are not sent one by one
+                stream = io.TextIOWrapper(io.BufferedWriter(self.wfile), encoding='utf-8', newline='')
+                try:
+                    writer = write_jsonl if export_format == 'jsonl' else write_csv
+                    writer(iter_publications(conn, filters), stream)
+                    stream.flush()
+                finally:
+                    # Leave closing wfile to the request handler
+                    stream.detach().detach()
+
+            else:
+                self._send_error(404, "Not found")
+
+        except sqlite3.OperationalError as e:
+            logger.error(f"Query failed: {e}")
+            self._send_error(400, str(e))
+        finally:
+            conn.close()
+
+    def _send_error(self, code, message):
+        body = json.dumps({'error': message})
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(body.encode('utf-8'))
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s" % (self.address_string(), format % args))
+
+def serve(db_file=DEFAULT_DB_FILE, host='127.0.0.1', port=8000):
+    """
+    Run the HTTP API until interrupted.
+
+    Args:
+        db_file (str): Path to the SQLite database file
+        host (str): Interface to bind to
+        port (int): Port to listen on
+    """
+    # Create the schema once; request handlers only connect
+    open_store(db_file).close()
+    handler = type('Handler', (PublicationRequestHandler,), {'db_file': db_file})
+    server = ThreadingHTTPServer((host, port), handler)
+    logger.info(f"Serving publications from {db_file} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def _date_argument(value):
+    """argparse type for date range bounds."""
+    try:
+        _date_bound(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
+def _add_filter_arguments(parser):
+    """Add the shared filter options to a sub-command parser."""
+    parser.add_argument("--year", help="Publication year as listed on the Fraunhofer page")
+    parser.add_argument("--type", dest="publication_type", help="Publication type")
+    parser.add_argument("--keyword", help="Full-text search in title and abstract (use word* for prefixes)")
+    parser.add_argument("--author", help="Author name")
+    parser.add_argument("--from", dest="date_from", type=_date_argument,
+                        help="Earliest publication date (YYYY, YYYY-MM or YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", type=_date_argument,
+                        help="Latest publication date, inclusive (YYYY, YYYY-MM or YYYY-MM-DD)")
+
+def main(argv=None):
+    """Command line interface for the publication store."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Query and export stored KlingelAI publications")
+    parser.add_argument("--db", default=DEFAULT_DB_FILE, help=f"Database file (default: {DEFAULT_DB_FILE})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    query_parser = subparsers.add_parser("query", help="Show matching publications")
+    _add_filter_arguments(query_parser)
+    query_parser.add_argument("--page", type=int, default=1)
+    query_parser.add_argument("--per-page", type=int, default=20)
+
+    export_parser = subparsers.add_parser("export", help="Export matching publications")
+    _add_filter_arguments(export_parser)
+    export_parser.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl")
+    export_parser.add_argument("--output", default="-", help="Output file ('-' for stdout)")
+
+    serve_parser = subparsers.add_parser("serve", help="Run the HTTP API")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.db, args.host, args.port)
+        return 0
+
+    if not os.path.exists(args.db):
+        logger.error(f"Database not found: {args.db}")
+        return 1
+
+    filters = {
+        'year': args.year,
+        'publication_type': args.publication_type,
+        'keyword': args.keyword,
+        'author': args.author,
+        'date_from': args.date_from,
+        'date_to': args.date_to
+    }
+
+    conn = open_store(args.db)
+    try:
+        if args.command == "query":
+            result = query_publications(conn, filters, args.page, args.per_page)
+            print(json.dumps(result, ensure_ascii=False, indent=2))
+        else:
+            count = export_publications(conn, args.format, args.output, filters)
+            logger.info(f"Exported {count} publications")
+    except (sqlite3.OperationalError, ValueError, RuntimeError) as e:
+        logger.error(f"{args.command} failed: {e}")
+        return 1
+    finally:
+        conn.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ Test email configuration for KlingelAI - Detailed Diagnostics
 """
 import smtplib
 import socket
+import sys
 from email.mime.text import MIMEText
 
 # EMAIL CONFIGURATION - UPDATE THESE VALUES
@@ -66,154 +67,162 @@ def check_email_configuration():
         print("✅ All email configuration values are set!")
         return True
 
-def test_network_connectivity(smtp_server, smtp_port):
+def test_network_connectivity(smtp_server, smtp_port, timeout=10, out=None):
     """Test network connectivity to SMTP server."""
-    print(f"🌐 Network Connectivity Test")
-    print("=" * 50)
+    out = out or sys.stdout
+
+    print(f"🌐 Network Connectivity Test", file=out)
+    print("=" * 50, file=out)
     
     try:
-        print(f"🔌 Testing connection to {smtp_server}:{smtp_port}...")
-        socket.create_connection((smtp_server, smtp_port), timeout=10)
-        print("✅ Network connection successful!")
+        print(f"🔌 Testing connection to {smtp_server}:{smtp_port}...", file=out)
+        socket.create_connection((smtp_server, smtp_port), timeout=timeout).close()
+        print("✅ Network connection successful!", file=out)
         return True
     except socket.timeout:
-        print(f"❌ Connection timeout to {smtp_server}:{smtp_port}")
-        print("   Possible issues:")
-        print("   - Server is down")
-        print("   - Firewall blocking connection")
-        print("   - VPN required for campus network")
+        print(f"❌ Connection timeout to {smtp_server}:{smtp_port}", file=out)
+        print("   Possible issues:", file=out)
+        print("   - Server is down", file=out)
+        print("   - Firewall blocking connection", file=out)
+        print("   - VPN required for campus network", file=out)
         return False
     except socket.gaierror as e:
-        print(f"❌ DNS resolution failed: {e}")
-        print("   Possible issues:")
-        print("   - Incorrect server hostname")
-        print("   - DNS server issues")
+        print(f"❌ DNS resolution failed: {e}", file=out)
+        print("   Possible issues:", file=out)
+        print("   - Incorrect server hostname", file=out)
+        print("   - DNS server issues", file=out)
         return False
     except Exception as e:
-        print(f"❌ Network error: {e}")
+        print(f"❌ Network error: {e}", file=out)
         return False
 
-def test_smtp_connection(smtp_server, smtp_port):
+def test_smtp_connection(smtp_server, smtp_port, timeout=10, out=None):
     """Test SMTP server connection and capabilities."""
-    print(f"📡 SMTP Server Test")
-    print("=" * 50)
+    out = out or sys.stdout
+
+    print(f"📡 SMTP Server Test", file=out)
+    print("=" * 50, file=out)
     
     try:
-        print(f"🔌 Connecting to SMTP server {smtp_server}:{smtp_port}...")
-        server = smtplib.SMTP(smtp_server, smtp_port)
+        print(f"🔌 Connecting to SMTP server {smtp_server}:{smtp_port}...", file=out)
+        server = smtplib.SMTP(smtp_server, smtp_port, timeout=timeout)
         
-        print("✅ SMTP connection established!")
+        print("✅ SMTP connection established!", file=out)
         
         # Get server capabilities
-        print("📋 Server capabilities:")
+        print("📋 Server capabilities:", file=out)
         if hasattr(server, 'ehlo'):
             code, response = server.ehlo()
             if code == 250:
                 capabilities = response.decode().split('\n')
                 for cap in capabilities[1:]:  # Skip first line (server name)
                     if cap.strip():
-                        print(f"   - {cap.strip()}")
+                        print(f"   - {cap.strip()}", file=out)
         
-        print("🔒 Testing TLS support...")
+        print("🔒 Testing TLS support...", file=out)
         server.starttls()
-        print("✅ TLS connection established!")
+        print("✅ TLS connection established!", file=out)
         
         server.quit()
         return True
         
     except smtplib.SMTPException as e:
-        print(f"❌ SMTP error: {e}")
+        print(f"❌ SMTP error: {e}", file=out)
         return False
     except Exception as e:
-        print(f"❌ Connection error: {e}")
+        print(f"❌ Connection error: {e}", file=out)
         return False
 
-def test_authentication(smtp_server, smtp_port, sender, password):
+def test_authentication(smtp_server, smtp_port, sender, password, timeout=10, out=None):
     """Test SMTP authentication."""
-    print(f"🔑 Authentication Test")
-    print("=" * 50)
+    out = out or sys.stdout
+
+    print(f"🔑 Authentication Test", file=out)
+    print("=" * 50, file=out)
     
     try:
-        print(f"🔌 Connecting to {smtp_server}:{smtp_port}...")
-        server = smtplib.SMTP(smtp_server, smtp_port)
+        print(f"🔌 Connecting to {smtp_server}:{smtp_port}...", file=out)
+        server = smtplib.SMTP(smtp_server, smtp_port, timeout=timeout)
         
-        print("🔒 Starting TLS...")
+        print("🔒 Starting TLS...", file=out)
         server.starttls()
         
-        print(f"🔑 Attempting authentication for {sender}...")
+        print(f"🔑 Attempting authentication for {sender}...", file=out)
         server.login(sender, password)
         
-        print("✅ Authentication successful!")
+        print("✅ Authentication successful!", file=out)
         server.quit()
         return True
         
     except smtplib.SMTPAuthenticationError as e:
-        print(f"❌ AUTHENTICATION FAILED: {e}")
-        print()
-        print("🔍 DETAILED DIAGNOSIS:")
+        print(f"❌ AUTHENTICATION FAILED: {e}", file=out)
+        print(file=out)
+        print("🔍 DETAILED DIAGNOSIS:", file=out)
         error_code = str(e).split()[0] if str(e) else "Unknown"
         
         if "535" in str(e):
-            print("   Error 535: Invalid credentials")
-            print("   ➤ Your username/password combination is incorrect")
-            print()
-            print("💡 SOLUTIONS:")
-            print("   1. ✅ Verify your email address is exactly correct")
-            print("   2. 🔑 Use an APP-SPECIFIC PASSWORD (not your regular password)")
-            print("   3. 🔐 Check if 2FA is enabled (requires app password)")
-            print("   4. 📞 Contact HS-Ruhrwest IT support")
+            print("   Error 535: Invalid credentials", file=out)
+            print("   ➤ Your username/password combination is incorrect", file=out)
+            print(file=out)
+            print("💡 SOLUTIONS:", file=out)
+            print("   1. ✅ Verify your email address is exactly correct", file=out)
+            print("   2. 🔑 Use an APP-SPECIFIC PASSWORD (not your regular password)", file=out)
+            print("   3. 🔐 Check if 2FA is enabled (requires app password)", file=out)
+            print("   4. 📞 Contact HS-Ruhrwest IT support", file=out)
             
         elif "534" in str(e):
-            print("   Error 534: Authentication mechanism not supported")
-            print("   ➤ Server requires different authentication method")
+            print("   Error 534: Authentication mechanism not supported", file=out)
+            print("   ➤ Server requires different authentication method", file=out)
             
         elif "530" in str(e):
-            print("   Error 530: Authentication required")
-            print("   ➤ Server requires authentication but credentials failed")
+            print("   Error 530: Authentication required", file=out)
+            print("   ➤ Server requires authentication but credentials failed", file=out)
             
         else:
-            print(f"   Unknown authentication error: {e}")
+            print(f"   Unknown authentication error: {e}", file=out)
         
-        print()
-        print("🛠️  NEXT STEPS:")
-        print("   1. Generate app-specific password in your email account")
-        print("   2. Update environment variable:")
-        print("      export SENDER_PASSWORD='your-app-specific-password'")
-        print("   3. Run this test again")
+        print(file=out)
+        print("🛠️  NEXT STEPS:", file=out)
+        print("   1. Generate app-specific password in your email account", file=out)
+        print("   2. Update environment variable:", file=out)
+        print("      export SENDER_PASSWORD='your-app-specific-password'", file=out)
+        print("   3. Run this test again", file=out)
         
         server.quit()
         return False
         
     except Exception as e:
-        print(f"❌ Unexpected error during authentication: {e}")
+        print(f"❌ Unexpected error during authentication: {e}", file=out)
         return False
 
-def test_email_sending(smtp_server, smtp_port, sender, password, recipient):
+def test_email_sending(smtp_server, smtp_port, sender, password, recipient, timeout=10, out=None):
     """Test actual email sending."""
-    print(f"📧 Email Sending Test")
-    print("=" * 50)
+    out = out or sys.stdout
+
+    print(f"📧 Email Sending Test", file=out)
+    print("=" * 50, file=out)
     
     try:
-        server = smtplib.SMTP(smtp_server, smtp_port)
+        server = smtplib.SMTP(smtp_server, smtp_port, timeout=timeout)
         server.starttls()
         server.login(sender, password)
         
-        print("📝 Composing test email...")
+        print("📝 Composing test email...", file=out)
         msg = MIMEText("This is a test email from KlingelAI configuration test.\n\nIf you receive this, your email setup is working correctly!")
         msg['Subject'] = 'KlingelAI Email Configuration Test - SUCCESS'
         msg['From'] = sender
         msg['To'] = recipient
         
-        print(f"📤 Sending test email to {recipient}...")
+        print(f"📤 Sending test email to {recipient}...", file=out)
         server.sendmail(sender, recipient, msg.as_string())
         server.quit()
         
-        print("✅ Test email sent successfully!")
-        print(f"📬 Check {recipient} for the test message")
+        print("✅ Test email sent successfully!", file=out)
+        print(f"📬 Check {recipient} for the test message", file=out)
         return True
         
     except Exception as e:
-        print(f"❌ Failed to send test email: {e}")
+        print(f"❌ Failed to send test email: {e}", file=out)
         return False
 
 def test_email_connection():